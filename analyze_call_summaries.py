@@ -0,0 +1,276 @@
+# analyze_call_summaries.py
+"""
+Analyse incrémentale de call_summaries.json.
+
+Lit le fichier en streaming (une entrée à la fois, mémoire bornée), reprend
+au dernier offset traité grâce à un checkpoint, agrège par jour et écrit un
+rapport JSON par jour dans reports/.
+
+Usage :
+    python analyze_call_summaries.py            # traite les nouvelles entrées
+    python analyze_call_summaries.py --reset    # repart de zéro
+"""
+import argparse, codecs, json, os, re
+from collections import Counter
+
+# ---------------------------
+# CONFIGURATION
+# ---------------------------
+SUMMARY_FILE = "call_summaries.json"
+CHECKPOINT_FILE = "call_summaries.checkpoint.json"
+REPORTS_DIR = "reports"
+
+CHUNK_SIZE = 64 * 1024      # octets lus à chaque fois
+CHECKPOINT_EVERY = 5000     # entrées traitées entre deux sauvegardes du checkpoint
+MAX_PHRASINGS = 200         # formulations d'interview_time gardées par jour
+MAX_ENTRY_CHARS = 1024 * 1024   # au-delà, l'entrée en cours est jugée corrompue
+
+SEPARATORS = " \t\r\n,["
+ENTRY_START = "\n  {"       # début d'une entrée du tableau (json.dump indent=2)
+
+WEEKDAYS_RE = re.compile(r"\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b")
+MONTHS_RE = re.compile(r"\b(january|february|march|april|may|june|july|august|september|"
+                       r"october|november|december)\b")
+NUMBER_RE = re.compile(r"\d+(st|nd|rd|th)?")
+SPACES_RE = re.compile(r"\s+")
+
+
+# ---------------------------
+# LECTURE EN STREAMING
+# ---------------------------
+def iter_entries(path, offset=0, chunk_size=CHUNK_SIZE):
+    """
+    Renvoie (entry, end_offset) pour chaque objet du tableau JSON, à partir
+    de l'octet `offset`. end_offset est la position juste après l'objet :
+    save_summary réécrit le tableau en ajoutant à la fin, donc cette position
+    reste valide d'un run à l'autre.
+
+    Une entrée illisible mais complète (suivie d'une autre entrée, ou du `]`
+    final) est sautée avec entry=None pour que le checkpoint avance. Une
+    entrée tronquée en fin de fichier (écriture en cours) est laissée pour le
+    prochain run.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    base = offset       # offset (octets) de text[mark]
+    text, pos, mark = "", 0, 0
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while True:
+            while pos < len(text) and text[pos] in SEPARATORS:
+                pos += 1
+
+            if pos < len(text):
+                if text[pos] == "]":
+                    return
+                try:
+                    entry, end = decoder.raw_decode(text, pos)
+                except json.JSONDecodeError:
+                    entry, end = None, None
+                    next_start = text.find(ENTRY_START, pos)
+                    if next_start != -1:
+                        print(f"[WARNING] Corrupt entry after byte {base}, skipped.")
+                        end = next_start
+                if end is not None:
+                    base += len(text[mark:end].encode("utf-8"))
+                    pos = mark = end
+                    yield (entry if isinstance(entry, dict) else None), base
+                    continue
+                if len(text) - pos > MAX_ENTRY_CHARS:
+                    raise ValueError(f"Entry after byte {base} is larger than "
+                                     f"{MAX_ENTRY_CHARS} characters, {path} looks corrupt.")
+
+            chunk = f.read(chunk_size)
+            if not chunk:
+                tail = text[pos:].rstrip()
+                if tail.endswith("]"):
+                    # Fichier complet : la dernière entrée est illisible
+                    print(f"[WARNING] Corrupt entry after byte {base}, skipped.")
+                    end = pos + len(tail) - 1
+                    yield None, base + len(text[mark:end].encode("utf-8"))
+                elif tail:
+                    print(f"[WARNING] Incomplete entry after byte {base}, will retry next run.")
+                return
+            text = text[mark:] + utf8.decode(chunk)
+            pos, mark = pos - mark, 0
+
+
+# ---------------------------
+# NORMALISATION
+# ---------------------------
+def is_qualified(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("yes", "true", "oui", "qualified")
+    return bool(value)
+
+
+def is_scheduled(structured_data):
+    """L'agent annonce un entretien fixé (texte libre de next_step)."""
+    next_step = str(structured_data.get("next_step") or "").lower()
+    return "schedul" in next_step or "book" in next_step
+
+
+def phrasing_shape(text):
+    """
+    Réduit une formulation d'interview_time à sa forme :
+    "Friday, November 21st, between 9 AM and 3:15 PM"
+    -> "<weekday>, <month> <n>, between <n> am and <n>:<n> pm"
+    """
+    if not text or not isinstance(text, str):
+        return "<missing>"
+    s = text.strip().lower()
+    s = WEEKDAYS_RE.sub("<weekday>", s)
+    s = MONTHS_RE.sub("<month>", s)
+    s = NUMBER_RE.sub("<n>", s)
+    return SPACES_RE.sub(" ", s)
+
+
+# ---------------------------
+# AGRÉGATION
+# ---------------------------
+def new_day():
+    return {"calls": 0, "analyzed": 0, "qualified": 0, "interview_time_given": 0,
+            "scheduled": 0, "booking_attempts": 0, "booked": 0, "phrasings": {}}
+
+
+def aggregate(entry, days):
+    """Ajoute une entrée aux agrégats par jour `days` (modifié sur place), renvoie le jour."""
+    sd = entry.get("structured_data") or {}
+    day = str(entry.get("timestamp") or "unknown")[:10]
+    agg = days.get(day)
+    if agg is None:
+        agg = days[day] = new_day()
+
+    agg["calls"] += 1
+    if sd or entry.get("summary"):
+        agg["analyzed"] += 1
+    if is_qualified(sd.get("qualified")):
+        agg["qualified"] += 1
+    if is_scheduled(sd):
+        agg["scheduled"] += 1
+
+    # Résultat réel du booking TidyCal, enregistré par save_summary
+    booking = entry.get("booking")
+    if booking in ("booked", "failed"):
+        agg["booking_attempts"] += 1
+        if booking == "booked":
+            agg["booked"] += 1
+
+    raw_time = sd.get("interview_time")
+    if raw_time:
+        agg["interview_time_given"] += 1
+        phrasings = agg["phrasings"]
+        shape = phrasing_shape(raw_time)
+        phrasings[shape] = phrasings.get(shape, 0) + 1
+        # Borne la mémoire : on ne garde que les formes les plus fréquentes
+        if len(phrasings) > 2 * MAX_PHRASINGS:
+            agg["phrasings"] = dict(Counter(phrasings).most_common(MAX_PHRASINGS))
+    return day
+
+
+def day_report(day, agg):
+    def rate(num, den):
+        return round(num / den, 4) if den else None
+
+    return {
+        "day": day,
+        "calls": agg["calls"],
+        "analyzed": agg["analyzed"],
+        "qualified": agg["qualified"],
+        "qualification_rate": rate(agg["qualified"], agg["analyzed"]),
+        "interview_time_given": agg["interview_time_given"],
+        "scheduled": agg["scheduled"],
+        "scheduled_rate": rate(agg["scheduled"], agg["qualified"]),
+        "booking_attempts": agg["booking_attempts"],
+        "booked": agg["booked"],
+        "booking_success_rate": rate(agg["booked"], agg["booking_attempts"]),
+        "top_interview_time_phrasings": Counter(agg["phrasings"]).most_common(10),
+    }
+
+
+# ---------------------------
+# CHECKPOINT
+# ---------------------------
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return {"offset": 0, "processed": 0, "days": {}}
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    # Checkpoints écrits avant l'ajout de nouveaux compteurs
+    for agg in state["days"].values():
+        for key, value in new_day().items():
+            agg.setdefault(key, value)
+    return state
+
+
+def save_checkpoint(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# ---------------------------
+# MAIN LOGIC
+# ---------------------------
+def run(summary_file=SUMMARY_FILE, checkpoint_file=CHECKPOINT_FILE,
+        reports_dir=REPORTS_DIR, checkpoint_every=CHECKPOINT_EVERY, reset=False):
+    """Traite les nouvelles entrées et renvoie (nb_traitées, jours_touchés)."""
+    state = {"offset": 0, "processed": 0, "days": {}} if reset else load_checkpoint(checkpoint_file)
+
+    if not os.path.exists(summary_file):
+        print(f"[INFO] [*] {summary_file} not found, nothing to analyze.")
+        return 0, set()
+    if os.path.getsize(summary_file) < state["offset"]:
+        print("[WARNING] Summary file is shorter than the checkpoint, restarting from zero.")
+        state = {"offset": 0, "processed": 0, "days": {}}
+
+    days, touched, count, pending = state["days"], set(), 0, 0
+    for entry, end in iter_entries(summary_file, state["offset"]):
+        state["offset"] = end
+        if entry is None:
+            continue
+        touched.add(aggregate(entry, days))
+        count += 1
+        pending += 1
+        if pending >= checkpoint_every:
+            state["processed"] += pending
+            save_checkpoint(checkpoint_file, state)
+            pending = 0
+
+    state["processed"] += pending
+    save_checkpoint(checkpoint_file, state)
+
+    if touched:
+        os.makedirs(reports_dir, exist_ok=True)
+        for day in sorted(touched):
+            with open(os.path.join(reports_dir, f"{day}.json"), "w", encoding="utf-8") as f:
+                json.dump(day_report(day, days[day]), f, indent=2, ensure_ascii=False)
+
+    return count, touched
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Incremental analysis of call_summaries.json")
+    ap.add_argument("--file", default=SUMMARY_FILE)
+    ap.add_argument("--checkpoint", default=CHECKPOINT_FILE)
+    ap.add_argument("--reports-dir", default=REPORTS_DIR)
+    ap.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY)
+    ap.add_argument("--reset", action="store_true", help="ignore the checkpoint")
+    args = ap.parse_args()
+
+    count, touched = run(args.file, args.checkpoint, args.reports_dir,
+                         args.checkpoint_every, args.reset)
+    print(f"[INFO] [*] {count} new entries processed, {len(touched)} day report(s) updated.")
+
+    state = load_checkpoint(args.checkpoint)
+    for day in sorted(touched):
+        r = day_report(day, state["days"][day])
+        print(f"  {day}: {r['calls']} calls, qualified {r['qualified']}/{r['analyzed']} "
+              f"(rate {r['qualification_rate']}), scheduled {r['scheduled']}, "
+              f"booked {r['booked']}/{r['booking_attempts']} (rate {r['booking_success_rate']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# benchmarks/call_summaries_analysis.py
+"""
+Benchmark de analyze_call_summaries sur un call_summaries.json synthétique.
+
+Génère N entrées au même format que save_summary (json.dump indent=2), mesure
+le débit (run non tracé) et le pic mémoire (run séparé sous tracemalloc)
+d'une analyse complète, puis d'une reprise incrémentale après ajout de
+nouvelles entrées.
+
+Usage :
+    python benchmarks/call_summaries_analysis.py --entries 100000
+"""
+import argparse, json, os, random, shutil, sys, tempfile, time, tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import analyze_call_summaries as analysis
+
+PHRASINGS = [
+    "Friday, November {d}th, between 9 AM and 3:15 PM",
+    "Thursday, November {d}th at 10 AM",
+    "Monday {d} at 2:30 PM",
+    "next Tuesday morning",
+    "Not scheduled",
+]
+
+
+def synthetic_entry(rng, ts):
+    if rng.random() < 0.2:
+        structured = {}
+    else:
+        qualified = rng.random() < 0.6
+        structured = {
+            "next_step": "Interview scheduled" if qualified and rng.random() < 0.8 else "None",
+            "qualified": qualified,
+            "candidate_name": rng.choice(["Caleb", "Zoë", "Renée", "Daniel"]),
+            "interview_time": rng.choice(PHRASINGS).format(d=rng.randint(1, 28)),
+            "sales_experience": f"{rng.randint(0, 15)} years",
+        }
+    booking = "skipped"
+    if structured.get("qualified"):
+        booking = "booked" if rng.random() < 0.9 else "failed"
+    return {
+        "number": f"+1{rng.randint(2000000000, 9999999999)}",
+        "timestamp": ts.strftime("%Y-%m-%d %H:%M:%S"),
+        "summary": "Pré-sélection du candidat. " * rng.randint(0, 6),
+        "structured_data": structured,
+        "booking": booking,
+    }
+
+
+def format_entry(entry):
+    """Reproduit l'indentation d'une entrée dans json.dump(list, indent=2)."""
+    body = json.dumps(entry, indent=2, ensure_ascii=False)
+    return "\n".join("  " + line for line in body.splitlines())
+
+
+def write_entries(path, entries, append=False):
+    """Écrit (ou ajoute à) un tableau JSON sans le charger en mémoire."""
+    if not append:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("[\n")
+            for i, e in enumerate(entries):
+                f.write((",\n" if i else "") + format_entry(e))
+            f.write("\n]")
+        return
+    with open(path, "r+b") as f:
+        f.seek(-2, os.SEEK_END)     # retire "\n]"
+        f.truncate()
+        for e in entries:
+            f.write((",\n" + format_entry(e)).encode("utf-8"))
+        f.write(b"\n]")
+
+
+def entries_stream(rng, n, start):
+    for i in range(n):
+        yield synthetic_entry(rng, start + timedelta(seconds=30 * i))
+
+
+def measure(checkpoint_file, **kwargs):
+    """
+    Deux passes sur le même état de départ : une chronométrée, une sous
+    tracemalloc pour le pic mémoire (tracemalloc ralentit ~2.5x le débit).
+    """
+    saved = None
+    if os.path.exists(checkpoint_file):
+        with open(checkpoint_file, "rb") as f:
+            saved = f.read()
+
+    t0 = time.perf_counter()
+    count, touched = analysis.run(checkpoint_file=checkpoint_file, **kwargs)
+    elapsed = time.perf_counter() - t0
+
+    if saved is None:
+        os.remove(checkpoint_file)
+    else:
+        with open(checkpoint_file, "wb") as f:
+            f.write(saved)
+
+    tracemalloc.start()
+    analysis.run(checkpoint_file=checkpoint_file, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, touched, elapsed, peak
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark analyze_call_summaries")
+    ap.add_argument("--entries", type=int, default=100_000)
+    ap.add_argument("--append", type=int, default=1_000)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    start = datetime(2025, 11, 1, 7, 0, 0)
+    tmp = tempfile.mkdtemp(prefix="summaries_bench_")
+    try:
+        summary = os.path.join(tmp, "call_summaries.json")
+        kwargs = dict(summary_file=summary,
+                      checkpoint_file=os.path.join(tmp, "checkpoint.json"),
+                      reports_dir=os.path.join(tmp, "reports"))
+
+        write_entries(summary, entries_stream(rng, args.entries, start))
+        size_mb = os.path.getsize(summary) / 1e6
+        print(f"[INFO] {args.entries} entries, {size_mb:.1f} MB")
+
+        count, touched, elapsed, peak = measure(**kwargs)
+        print(f"[FULL] {count} entries in {elapsed:.2f}s "
+              f"({count / elapsed:,.0f} entries/s), {len(touched)} days, "
+              f"peak {peak / 1e6:.1f} MB")
+
+        later = start + timedelta(seconds=30 * args.entries)
+        write_entries(summary, entries_stream(rng, args.append, later), append=True)
+        count, touched, elapsed, peak = measure(**kwargs)
+        print(f"[INCREMENTAL] {count} new entries in {elapsed:.3f}s, "
+              f"{len(touched)} days, peak {peak / 1e6:.1f} MB")
+        if count != args.append:
+            print(f"[ERROR] Expected {args.append} new entries, got {count}")
+            return 1
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
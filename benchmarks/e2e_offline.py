@@ -0,0 +1,216 @@
+# benchmarks/e2e_offline.py
+"""
+Benchmark de bout en bout, hors ligne : gmail_scan → job_loop → save_summary
+→ booking TidyCal, avec les doublures de benchmarks/fakes.py et une horloge
+simulée (les sleep de job_loop avancent le temps au lieu d'attendre).
+
+Le vrai code de combined_runner / get_applicants_number / lead_queue est
+exécuté ; seuls auth_gmail, get_client, BASE_URL et l'horloge sont remplacés.
+
+Rapport : leads/heure, issues d'appel (tirées et loggées), appels d'API par
+lead, p50/p95 de chaque étape (temps simulé et temps réel).
+
+Usage :
+    python benchmarks/e2e_offline.py --days 3 --rate 4
+    python benchmarks/e2e_offline.py --json e2e_report.json    # pour suivi
+    python benchmarks/e2e_offline.py --outcomes ended=0.5,failed=0.2,timeout=0.1,create-error=0.2
+"""
+import argparse, contextlib, csv, io, json, os, shutil, sys, tempfile, time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fakes import (DEFAULT_OUTCOMES, FakeGmailService, FakeVapi, SimClock, SimulationOver,
+                   TidyCalStub, make_sim_datetime, parse_outcomes)
+
+EASTERN = ZoneInfo("America/New_York")
+CALLING_HOURS_PER_DAY = 9       # is_within_hours : 7h → 16h ET
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+class StageTimer:
+    """Enveloppe des fonctions du pipeline et mesure chaque appel."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.samples = defaultdict(list)    # étape -> [(sim s, wall s)]
+
+    def wrap(self, stage, fn):
+        def timed(*args, **kwargs):
+            t_sim, t_wall = self.clock.time(), time.perf_counter()
+            result = fn(*args, **kwargs)     # SimulationOver : mesure abandonnée
+            self.samples[stage].append((self.clock.time() - t_sim,
+                                        time.perf_counter() - t_wall))
+            return result
+        return timed
+
+    def report(self):
+        out = {}
+        for stage, samples in self.samples.items():
+            sim = [s for s, _ in samples]
+            wall = [w for _, w in samples]
+            out[stage] = {
+                "count": len(samples),
+                "sim_p50_s": percentile(sim, 50),
+                "sim_p95_s": percentile(sim, 95),
+                "wall_p50_ms": percentile(wall, 50) * 1000,
+                "wall_p95_ms": percentile(wall, 95) * 1000,
+            }
+        return out
+
+
+def run(args):
+    start = datetime(2025, 11, 17, 6, 30, tzinfo=EASTERN).astimezone(timezone.utc)
+    end = start + timedelta(days=args.days)
+    clock = SimClock(start, end)
+
+    gmail = FakeGmailService(clock, start, end, args.rate, seed=args.seed,
+                             latency=args.gmail_latency)
+    vapi = FakeVapi(clock, seed=args.seed, outcomes=args.outcomes,
+                    qualified_rate=args.qualified_rate,
+                    duration_minutes=(args.duration_min, args.duration_max),
+                    latency=args.vapi_latency)
+
+    import combined_runner, get_applicants_number, lead_queue
+
+    sim_datetime = make_sim_datetime(clock)
+    timer = StageTimer(clock)
+
+    # Horloge simulée
+    combined_runner.time = SimpleNamespace(sleep=clock.sleep, time=clock.time)
+    combined_runner.dt = sim_datetime
+    combined_runner.datetime = SimpleNamespace(datetime=sim_datetime)
+    lead_queue.datetime = sim_datetime
+
+    # Services externes
+    get_applicants_number.auth_gmail = lambda: gmail
+    combined_runner.get_client = lambda: vapi
+    combined_runner.BOOKING_TYPE_ID = "1"
+
+    # Étapes mesurées
+    get_applicants_number.main = timer.wrap("gmail_scan", get_applicants_number.main)
+    for stage in ("get_numbers_to_call", "create_call", "wait_for_completion",
+                  "save_summary", "book_meeting_local"):
+        setattr(combined_runner, stage, timer.wrap(stage, getattr(combined_runner, stage)))
+
+    with TidyCalStub(clock, latency=args.tidycal_latency,
+                     failure_rate=args.booking_failure_rate, seed=args.seed) as tidycal:
+        combined_runner.BASE_URL = tidycal.url
+        log = sys.stdout if args.verbose else io.StringIO()
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(log):
+            try:
+                combined_runner.job_loop()
+            except SimulationOver:
+                pass
+        wall = time.perf_counter() - t0
+
+    return build_report(args, gmail, vapi, tidycal, timer, wall)
+
+
+def build_report(args, gmail, vapi, tidycal, timer, wall):
+    discovered = set()
+    if os.path.exists("phone_numbers.csv"):
+        with open("phone_numbers.csv", newline="") as f:
+            discovered = {row["Number"] for row in csv.DictReader(f)}
+
+    # Statuts effectivement loggés par job_loop (timeout inclus)
+    logged = Counter()
+    if os.path.exists("called_numbers.csv"):
+        with open("called_numbers.csv", newline="") as f:
+            logged = Counter(row["Status"] for row in csv.DictReader(f))
+
+    dialed = {c["number"] for c in vapi.calls_made.values()}
+    reached = {c["number"] for c in vapi.calls_made.values() if c["outcome"] == "ended"}
+    n = len(dialed) or 1
+    api = {
+        "gmail": sum(gmail.api_calls.values()),
+        "vapi": sum(vapi.api_calls.values()),
+        "tidycal": sum(tidycal.api_calls.values()),
+    }
+    return {
+        "params": vars(args),
+        "applications": len(gmail.inbox),
+        "candidates": len(gmail.candidates),
+        "leads_discovered": len(discovered),
+        "leads_dialed": len(dialed),
+        "leads_reached": len(reached),
+        "calls": len(vapi.calls_made),
+        "outcomes": dict(vapi.outcomes),
+        "logged_statuses": dict(logged),
+        "bookings": len(tidycal.bookings),
+        "leads_per_hour": len(dialed) / (args.days * 24),
+        "leads_per_calling_hour": len(dialed) / (args.days * CALLING_HOURS_PER_DAY),
+        "api_calls_per_lead": {k: v / n for k, v in api.items()},
+        "api_calls_detail": {**gmail.api_calls, **vapi.api_calls, **tidycal.api_calls},
+        "stages": timer.report(),
+        "wall_seconds": wall,
+    }
+
+
+def print_report(r):
+    print(f"[INFO] {r['params']['days']} simulated days, {r['applications']} applications "
+          f"({r['candidates']} candidates), wall {r['wall_seconds']:.1f}s")
+    print(f"[LEADS] discovered {r['leads_discovered']}, dialed {r['leads_dialed']}, "
+          f"reached {r['leads_reached']}, calls {r['calls']}, bookings {r['bookings']}")
+    print(f"[CALLS] outcomes {r['outcomes']}, logged {r['logged_statuses']}")
+    print(f"[RATE] {r['leads_per_hour']:.2f} leads/h, "
+          f"{r['leads_per_calling_hour']:.2f} leads/calling-hour")
+    per_lead = ", ".join(f"{k} {v:.1f}" for k, v in r["api_calls_per_lead"].items())
+    print(f"[API] per dialed lead: {per_lead}")
+    print(f"      {dict(r['api_calls_detail'])}")
+    print(f"{'stage':<22} {'count':>6} {'sim p50 s':>10} {'sim p95 s':>10} "
+          f"{'wall p50 ms':>12} {'wall p95 ms':>12}")
+    for stage, s in r["stages"].items():
+        print(f"{stage:<22} {s['count']:>6} {s['sim_p50_s']:>10.1f} {s['sim_p95_s']:>10.1f} "
+              f"{s['wall_p50_ms']:>12.2f} {s['wall_p95_ms']:>12.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline end-to-end benchmark")
+    ap.add_argument("--days", type=float, default=3)
+    ap.add_argument("--rate", type=float, default=4, help="applications per hour")
+    ap.add_argument("--outcomes", type=parse_outcomes, default=DEFAULT_OUTCOMES,
+                    help="relative weights of ended, no-answer, failed, timeout, create-error "
+                         "(default: ended=0.6,no-answer=0.25,failed=0.1,create-error=0.05)")
+    ap.add_argument("--qualified-rate", type=float, default=0.5)
+    ap.add_argument("--duration-min", type=float, default=3, help="call minutes")
+    ap.add_argument("--duration-max", type=float, default=9)
+    ap.add_argument("--gmail-latency", type=float, default=0.15, help="simulated s/request")
+    ap.add_argument("--vapi-latency", type=float, default=0.3)
+    ap.add_argument("--tidycal-latency", type=float, default=0.4)
+    ap.add_argument("--booking-failure-rate", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", help="write the report to this file")
+    ap.add_argument("--verbose", action="store_true", help="show the pipeline logs")
+    args = ap.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    cwd, tmp = os.getcwd(), tempfile.mkdtemp(prefix="e2e_offline_")
+    os.chdir(tmp)       # les CSV / JSON du pipeline sont écrits ici
+    try:
+        report = run(args)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print_report(report)
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[SUCCESS] Report saved to {json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
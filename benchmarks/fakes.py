@@ -0,0 +1,328 @@
+# benchmarks/fakes.py
+"""
+Doublures locales pour faire tourner le pipeline sans compte Google, Vapi
+ni TidyCal :
+  - SimClock : horloge simulée (sleep avance le temps au lieu d'attendre) ;
+  - FakeGmailService : même interface que googleapiclient pour les appels
+    utilisés par get_applicants_number, avec des CV PDF synthétiques ;
+  - FakeVapi : client.calls.create / client.calls.get, durées et issues
+    d'appel configurables ;
+  - TidyCalStub : vrai serveur HTTP local qui imite POST /bookings.
+Chaque doublure compte ses appels d'API dans `api_calls`.
+"""
+import base64, json, random, re, threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+
+class SimulationOver(BaseException):
+    """Fin de la simulation. BaseException pour traverser le `except Exception` de job_loop."""
+
+
+# ---------------------------
+# HORLOGE SIMULÉE
+# ---------------------------
+class SimClock:
+    def __init__(self, start, end):
+        self.t = start.timestamp()
+        self.end = end.timestamp()
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self.t
+
+    def now(self):
+        return datetime.fromtimestamp(self.t, tz=timezone.utc)
+
+    def advance(self, seconds):
+        """Latence simulée d'un appel d'API (ne termine jamais la simulation)."""
+        with self._lock:
+            self.t += seconds
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+        if self.t >= self.end:
+            raise SimulationOver()
+
+
+def make_sim_datetime(clock):
+    """Sous-classe de datetime dont now() lit l'horloge simulée."""
+
+    class SimDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            now = clock.now()
+            return now.astimezone(tz) if tz else now.replace(tzinfo=None)
+
+    return SimDatetime
+
+
+# ---------------------------
+# CV SYNTHÉTIQUES
+# ---------------------------
+def make_pdf(lines):
+    """PDF minimal (une page, Helvetica) contenant `lines`."""
+    def esc(s):
+        return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    text = "BT /F1 12 Tf 72 720 Td " + " 0 -16 Td ".join(f"({esc(l)}) Tj" for l in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(text)} >>\nstream\n{text}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out, offsets = "%PDF-1.4\n", []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+AREA_CODES = ["212", "305", "404", "617", "312", "214", "713", "303", "602", "213", "415", "206"]
+FIRST_NAMES = ["Caleb", "Maya", "Daniel", "Ines", "Jordan", "Priya", "Luis", "Amara"]
+
+
+class _Request:
+    """Imite l'objet HttpRequest de googleapiclient (.execute())."""
+
+    def __init__(self, service, method, fn):
+        self._service, self._method, self._fn = service, method, fn
+
+    def execute(self):
+        self._service.api_calls[self._method] += 1
+        self._service.clock.advance(self._service.latency)
+        return self._fn()
+
+
+class FakeGmailService:
+    """
+    Boîte Gmail synthétique : des candidatures (PDF en pièce jointe) arrivent
+    selon un processus de Poisson ; list() ne voit que celles déjà reçues à
+    l'heure simulée. ~10 % des candidats renvoient un second CV.
+    """
+
+    def __init__(self, clock, start, end, rate_per_hour, seed=0, latency=0.15):
+        self.clock, self.latency = clock, latency
+        self.api_calls = Counter()
+        rng = random.Random(seed)
+        self.inbox, candidates = {}, []
+        t = start
+        while True:
+            t += timedelta(hours=rng.expovariate(rate_per_hour))
+            if t >= end:
+                break
+            if candidates and rng.random() < 0.1:
+                name, email, phone = rng.choice(candidates)
+            else:
+                name = f"{rng.choice(FIRST_NAMES)} {len(candidates)}"
+                email = f"candidate{len(candidates)}@example.com"
+                phone = f"{rng.choice(AREA_CODES)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}"
+                candidates.append((name, email, phone))
+            i = len(self.inbox)
+            self.inbox[f"msg{i}"] = {
+                "id": f"msg{i}",
+                "internalDate": str(int(t.timestamp() * 1000)),
+                "filename": f"resume_{i}.pdf",
+                "data": make_pdf([name, f"Phone: {phone}", email, "Sales experience: 5 years"]),
+                "from": f"{name} <{email}>",
+            }
+        self.candidates = candidates
+
+    # users().messages().attachments() : tout est servi par le même objet
+    def users(self):
+        return self
+
+    def attachments(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def list(self, userId, q, maxResults=100):
+        def run():
+            now_ms = self.clock.time() * 1000
+            received = [m for m in self.inbox.values() if int(m["internalDate"]) <= now_ms]
+            received.sort(key=lambda m: int(m["internalDate"]), reverse=True)
+            return {"messages": [{"id": m["id"]} for m in received[:maxResults]]}
+        return _Request(self, "messages.list", run)
+
+    def get(self, userId, id=None, messageId=None, format=None):
+        if messageId is not None:       # attachments().get(...)
+            def run():
+                data = self.inbox[messageId]["data"]
+                return {"data": base64.urlsafe_b64encode(data).decode("ascii")}
+            return _Request(self, "attachments.get", run)
+
+        def run():
+            m = self.inbox[id]
+            return {
+                "id": id,
+                "internalDate": m["internalDate"],
+                "payload": {
+                    "headers": [{"name": "From", "value": m["from"]}],
+                    "parts": [{"filename": m["filename"], "body": {"attachmentId": f"att-{id}"}}],
+                },
+            }
+        return _Request(self, "messages.get", run)
+
+
+# ---------------------------
+# VAPI
+# ---------------------------
+OUTCOMES = ("ended", "no-answer", "failed", "timeout", "create-error")
+DEFAULT_OUTCOMES = {"ended": 0.6, "no-answer": 0.25, "failed": 0.1, "create-error": 0.05}
+
+
+def parse_outcomes(text):
+    """Parse "ended=0.6,no-answer=0.3" en {"ended": 0.6, "no-answer": 0.3}."""
+    outcomes = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OUTCOMES:
+            raise ValueError(f"Unknown outcome {name!r} (expected one of {', '.join(OUTCOMES)})")
+        outcomes[name] = float(weight)
+    if sum(outcomes.values()) <= 0:
+        raise ValueError("Outcome weights must sum to more than 0")
+    return outcomes
+
+
+class FakeVapi:
+    """
+    Client Vapi simulé. L'issue de chaque appel est tirée dans `outcomes`
+    (poids relatifs) :
+      - "ended" : décroché, terminé après une durée tirée dans `duration_minutes` ;
+      - "no-answer" / "failed" : statut final après `ring_seconds` de sonnerie ;
+      - "timeout" : reste "in-progress", wait_for_completion abandonne ;
+      - "create-error" : calls.create lève une exception (erreur API).
+    """
+
+    def __init__(self, clock, seed=0, outcomes=None, qualified_rate=0.5,
+                 duration_minutes=(3, 9), ring_seconds=25, latency=0.3):
+        self.clock, self.latency = clock, latency
+        outcomes = dict(outcomes or DEFAULT_OUTCOMES)
+        self.outcome_names = list(outcomes)
+        self.outcome_weights = list(outcomes.values())
+        self.qualified_rate = qualified_rate
+        self.duration_minutes, self.ring_seconds = duration_minutes, ring_seconds
+        self.rng = random.Random(seed)
+        self.calls_made = {}
+        self.outcomes = Counter()
+        self.api_calls = Counter()
+        self.calls = self
+
+    def create(self, assistant_id, phone_number_id, customer):
+        self.api_calls["calls.create"] += 1
+        self.clock.advance(self.latency)
+        outcome = self.rng.choices(self.outcome_names, self.outcome_weights)[0]
+        self.outcomes[outcome] += 1
+        if outcome == "create-error":
+            raise RuntimeError("HTTP 400: Couldn't create call (simulated)")
+
+        call_id = f"call-{len(self.calls_made)}"
+        start = self.clock.time()
+        if outcome == "ended":
+            end = start + self.ring_seconds + 60 * self.rng.uniform(*self.duration_minutes)
+        elif outcome == "timeout":
+            end = float("inf")
+        else:
+            end = start + self.ring_seconds
+        self.calls_made[call_id] = {
+            "number": customer["number"], "start": start, "end": end, "outcome": outcome,
+            "qualified": outcome == "ended" and self.rng.random() < self.qualified_rate,
+        }
+        return SimpleNamespace(id=call_id, status="queued")
+
+    def get(self, call_id):
+        self.api_calls["calls.get"] += 1
+        self.clock.advance(self.latency)
+        c = self.calls_made[call_id]
+        now = self.clock.time()
+        if now < c["start"] + self.ring_seconds:
+            status = "ringing"
+        elif now < c["end"]:
+            status = "in-progress"
+        else:
+            status = c["outcome"]
+
+        analysis = SimpleNamespace(summary=None, structured_data=None)
+        if status == "ended":
+            analysis = SimpleNamespace(
+                summary="Synthetic pre-screen call.",
+                structured_data=self._structured_data(c),
+            )
+        return SimpleNamespace(id=call_id, status=status, analysis=analysis)
+
+    def _structured_data(self, c):
+        slot = datetime.fromtimestamp(c["end"], tz=timezone.utc) + timedelta(days=2)
+        return {
+            "qualified": c["qualified"],
+            "next_step": "Interview scheduled" if c["qualified"] else "None",
+            "candidate_name": "Synthetic Candidate",
+            "interview_time": slot.strftime("%A, %B %d at 10 AM") if c["qualified"] else "",
+        }
+
+
+# ---------------------------
+# TIDYCAL
+# ---------------------------
+class TidyCalStub:
+    """
+    Serveur HTTP local (thread) pour POST /booking-types/<id>/bookings.
+    `latency` secondes simulées sont ajoutées à l'horloge par requête.
+    """
+
+    def __init__(self, clock, latency=0.4, failure_rate=0.0, seed=0):
+        stub = self
+        self.clock, self.latency = clock, latency
+        self.failure_rate, self.rng = failure_rate, random.Random(seed)
+        self.api_calls = Counter()
+        self.bookings = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                stub.api_calls["POST bookings"] += 1
+                stub.clock.advance(stub.latency)
+                if not re.fullmatch(r"/booking-types/[^/]+/bookings", self.path):
+                    return self._send(404, {"message": "Not found"})
+                if stub.rng.random() < stub.failure_rate:
+                    return self._send(422, {"message": "The selected starts at is invalid."})
+                stub.bookings.append(body)
+                self._send(201, {"data": {
+                    "id": len(stub.bookings),
+                    "starts_at": body.get("starts_at"),
+                    "booking_type": {"title": "Interview"},
+                }})
+
+            def _send(self, code, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
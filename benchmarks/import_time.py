@@ -0,0 +1,152 @@
+# benchmarks/import_time.py
+"""
+Mesure le temps d'import (cold start) des modules du service avec
+`python -X importtime`, et vérifie que les dépendances lourdes ne sont
+pas chargées à l'import.
+
+Usage :
+    python benchmarks/import_time.py                    # mesure + rapport
+    python benchmarks/import_time.py --save             # enregistre la baseline
+    python benchmarks/import_time.py --check            # compare à la baseline
+"""
+import argparse, json, os, platform, re, statistics, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "import_time_baseline.json")
+
+MODULES = ["combined_runner", "get_applicants_number", "get_tidycal_data"]
+
+# Ne doivent PAS apparaître dans l'import de combined_runner
+HEAVY = ["vapi", "googleapiclient", "google_auth_oauthlib", "PyPDF2",
+         "docx", "fitz", "pytz", "dateutil", "requests"]
+
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+# ---------------------------
+# MESURE
+# ---------------------------
+def run_importtime(module):
+    """Lance un interpréteur neuf et renvoie les lignes -X importtime parsées."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        last = (proc.stderr.strip().splitlines() or ["?"])[-1]
+        raise RuntimeError(f"import {module} failed: {last}")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if m:
+            self_us, cumul_us, indent, name = m.groups()
+            entries.append({
+                "name": name,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumul_us),
+                "depth": (len(indent) - 1) // 2,
+            })
+    return entries
+
+
+def subtree(entries, module):
+    """
+    Entrées importées par `module` lui-même. -X importtime affiche les enfants
+    avant le parent : on remonte depuis la ligne du module tant que la
+    profondeur est > 0. Les modules déjà chargés au démarrage de
+    l'interpréteur (fichiers .pth, site) n'y figurent donc pas.
+    """
+    idx = max((i for i, e in enumerate(entries) if e["name"] == module and e["depth"] == 0),
+              default=None)
+    if idx is None:
+        return None, []
+    start = idx
+    while start > 0 and entries[start - 1]["depth"] > 0:
+        start -= 1
+    return entries[idx], entries[start:idx]
+
+
+def measure(module, runs):
+    totals, imported = [], set()
+    top = {}
+    for _ in range(runs):
+        target, children = subtree(run_importtime(module), module)
+        totals.append(target["cumulative_us"] if target else 0)
+        imported.update(e["name"].split(".")[0] for e in children)
+        for e in children:
+            if e["depth"] == 1:
+                top[e["name"]] = max(top.get(e["name"], 0), e["cumulative_us"])
+
+    heavy = sorted(h for h in HEAVY if h in imported)
+    slowest = sorted(top.items(), key=lambda kv: kv[1], reverse=True)[:10]
+    return {
+        "median_us": int(statistics.median(totals)),
+        "min_us": min(totals),
+        "max_us": max(totals),
+        "heavy_imported": heavy,
+        "slowest_direct": slowest,
+    }
+
+
+# ---------------------------
+# MAIN LOGIC
+# ---------------------------
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--save", action="store_true", help="write the baseline file")
+    ap.add_argument("--check", action="store_true", help="compare against the baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25,
+                    help="allowed slowdown vs baseline (0.25 = +25%%)")
+    args = ap.parse_args()
+
+    results = {}
+    for module in MODULES:
+        try:
+            results[module] = measure(module, args.runs)
+        except RuntimeError as e:
+            print(f"[ERROR] {e}")
+            continue
+        r = results[module]
+        print(f"[INFO] {module}: median {r['median_us'] / 1000:.1f} ms "
+              f"(min {r['min_us'] / 1000:.1f}, max {r['max_us'] / 1000:.1f}, {args.runs} runs)")
+        for name, us in r["slowest_direct"][:5]:
+            print(f"         {name:<30} {us / 1000:8.1f} ms")
+
+    failed = False
+    runner = results.get("combined_runner")
+    if runner and runner["heavy_imported"]:
+        print("[ERROR] Heavy modules loaded at import of combined_runner:",
+              ", ".join(runner["heavy_imported"]))
+        failed = True
+
+    if args.save and results:
+        baseline = {"_env": {"python": platform.python_version(), "machine": platform.platform()}}
+        baseline.update({m: {"median_us": r["median_us"], "min_us": r["min_us"]}
+                         for m, r in results.items()})
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"[SUCCESS] Baseline saved to {BASELINE_FILE}")
+
+    if args.check:
+        if not os.path.exists(BASELINE_FILE):
+            print("[ERROR] No baseline, run with --save first.")
+            return 1
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            baseline = json.load(f)
+        for module, r in results.items():
+            # Le minimum est bien plus stable que la médiane d'une machine à l'autre
+            ref = baseline.get(module, {}).get("min_us")
+            if not ref:
+                continue
+            ratio = r["min_us"] / ref
+            status = "OK" if ratio <= 1 + args.tolerance else "SLOWER"
+            print(f"[{status}] {module}: {ratio:.2f}x baseline")
+            failed = failed or status != "OK"
+
+    return 1 if failed or not results else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+# benchmarks/lead_queue_simulation.py
+"""
+Simulation du dial queue : ordre CSV (FIFO) vs LeadQueue.
+
+Un backlog de vieux leads + des candidatures qui arrivent pendant la journée
+(avec des doublons email/numéro et des indicatifs de tous les fuseaux US).
+Un seul agent appelle de 7h à 16h (ET), les appels sans réponse sont retentés.
+Mesure le délai candidature → premier appel pour les nouveaux candidats,
+les appels en double, puis le coût brut de push/pop.
+
+Usage :
+    python benchmarks/lead_queue_simulation.py --days 5 --backlog 300 --rate 6
+"""
+import argparse, os, random, statistics, sys, time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import lead_queue
+from lead_queue import LeadQueue
+
+EASTERN = ZoneInfo("America/New_York")
+AREA_CODES = ["212", "305", "404", "617", "312", "214", "713", "303", "602", "213", "415", "206"]
+ANSWER_RATE = 0.7
+GAP = timedelta(seconds=10)
+
+
+def make_lead(rng, received, email_pool):
+    # ~10% des candidatures = CV en double d'un candidat existant
+    if email_pool and rng.random() < 0.1:
+        email, number = rng.choice(email_pool)
+        if rng.random() < 0.5:
+            number = f"+1{rng.choice(AREA_CODES)}{rng.randint(2000000, 9999999)}"
+    else:
+        email = f"candidate{len(email_pool)}@example.com"
+        number = f"+1{rng.choice(AREA_CODES)}{rng.randint(2000000, 9999999)}"
+        email_pool.append((email, number))
+    return {"number": number, "email": email,
+            "received_at": received.timestamp(), "attempts": 0}
+
+
+def build_scenario(rng, days, backlog, rate, start):
+    pool = []
+    old = [make_lead(rng, start - timedelta(days=rng.uniform(1, 30)), pool)
+           for _ in range(backlog)]
+    old.sort(key=lambda l: l["received_at"])      # ordre d'ajout au CSV
+
+    arrivals, t = [], start
+    end = start + timedelta(days=days)
+    while True:
+        t += timedelta(hours=rng.expovariate(rate))
+        if t >= end:
+            break
+        arrivals.append(make_lead(rng, t, pool))
+    return old, arrivals
+
+
+class FifoQueue:
+    """Comportement actuel : ordre du CSV, pas de dédoublonnage ni d'heure locale."""
+
+    def __init__(self):
+        self._leads = deque()
+
+    def push(self, lead):
+        if lead["attempts"] < lead_queue.MAX_ATTEMPTS:
+            self._leads.append(lead)
+
+    def pop(self, now=None):
+        return self._leads.popleft() if self._leads else None
+
+    def __len__(self):
+        return len(self._leads)
+
+
+def simulate(queue, old, arrivals, days, start, seed):
+    rng = random.Random(seed)
+    for lead in old:
+        queue.push(dict(lead))
+
+    pending = deque(arrivals)
+    new_emails = {l["email"]: l["received_at"] for l in arrivals}
+    first_contact, contacted = {}, set()
+    calls = duplicates = 0
+
+    for day in range(days):
+        local_start = (start + timedelta(days=day)).astimezone(EASTERN)
+        t = local_start.replace(hour=7, minute=0).astimezone(timezone.utc)
+        day_end = local_start.replace(hour=16, minute=0).astimezone(timezone.utc)
+
+        while t < day_end:
+            # Les nouvelles candidatures arrivent au fil de l'eau (scan Gmail)
+            while pending and pending[0]["received_at"] <= t.timestamp():
+                queue.push(dict(pending.popleft()))
+
+            lead = queue.pop(t)
+            if lead is None:
+                t += timedelta(minutes=5)
+                continue
+
+            calls += 1
+            email = lead["email"]
+            if email in contacted:
+                duplicates += 1
+            if email in new_emails and email not in first_contact:
+                first_contact[email] = t.timestamp() - max(new_emails[email], lead["received_at"])
+
+            if rng.random() < ANSWER_RATE:
+                contacted.add(email)
+                t += timedelta(minutes=rng.uniform(3, 10)) + GAP
+            else:
+                t += timedelta(seconds=rng.uniform(30, 60)) + GAP
+                queue.push(dict(lead, attempts=lead["attempts"] + 1))
+
+    delays = sorted(d / 3600 for d in first_contact.values())
+    n_new = len(new_emails)
+    return {
+        "calls": calls,
+        "duplicates": duplicates,
+        "new_candidates": n_new,
+        "new_reached": len(delays),
+        "p50_h": statistics.median(delays) if delays else None,
+        "p95_h": delays[int(0.95 * (len(delays) - 1))] if delays else None,
+        "mean_h": statistics.fmean(delays) if delays else None,
+        "left_in_queue": len(queue),
+    }
+
+
+def bench_ops(n, seed, area_codes, now):
+    """
+    Coût moyen de push puis de pop jusqu'à vider les leads joignables. Les
+    leads d'indicatifs hors heures d'appel à `now` restent dans la file.
+    """
+    rng = random.Random(seed)
+    leads = [{"number": f"+1{rng.choice(area_codes)}{rng.randint(2000000, 9999999)}",
+              "email": f"c{i}@example.com", "received_at": rng.random() * 1e9,
+              "attempts": 0} for i in range(n)]
+    q = LeadQueue()
+    t0 = time.perf_counter()
+    for lead in leads:
+        q.push(lead)
+    t1 = time.perf_counter()
+    popped = 0
+    while q.pop(now):
+        popped += 1
+    t2 = time.perf_counter()
+    return (t1 - t0) / n * 1e6, (t2 - t1) / max(popped, 1) * 1e6, popped, len(q)
+
+
+def fmt(h):
+    return "   n/a" if h is None else f"{h:6.1f}"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Dial queue simulation")
+    ap.add_argument("--days", type=int, default=5)
+    ap.add_argument("--backlog", type=int, default=300)
+    ap.add_argument("--rate", type=float, default=6.0, help="new applicants per hour")
+    ap.add_argument("--ops", type=int, default=100_000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    start = datetime(2025, 11, 17, 0, 0, tzinfo=EASTERN).astimezone(timezone.utc)
+    old, arrivals = build_scenario(random.Random(args.seed), args.days,
+                                   args.backlog, args.rate, start)
+    print(f"[INFO] backlog {len(old)}, {len(arrivals)} new applications over {args.days} days")
+    print(f"{'strategy':<10} {'calls':>6} {'dupes':>6} {'reached':>9} "
+          f"{'p50 h':>6} {'p95 h':>6} {'mean h':>6} {'left':>6}")
+    for name, queue in (("fifo", FifoQueue()), ("priority", LeadQueue())):
+        r = simulate(queue, old, arrivals, args.days, start, args.seed)
+        print(f"{name:<10} {r['calls']:>6} {r['duplicates']:>6} "
+              f"{r['new_reached']:>4}/{r['new_candidates']:<4} "
+              f"{fmt(r['p50_h'])} {fmt(r['p95_h'])} {fmt(r['mean_h'])} {r['left_in_queue']:>6}")
+
+    cases = (
+        # midi ET : tout le monde est joignable
+        ("all callable", ["212"], datetime(2025, 11, 18, 17, 0, tzinfo=timezone.utc)),
+        # 9h ET = 6h PT : la moitié des leads (415) est différée
+        ("half deferred", ["212", "415"], datetime(2025, 11, 18, 14, 0, tzinfo=timezone.utc)),
+    )
+    for name, area_codes, now in cases:
+        push_us, pop_us, popped, left = bench_ops(args.ops, args.seed, area_codes, now)
+        print(f"[OPS] {name:<13} {args.ops} leads: push {push_us:.2f} µs/op, "
+              f"pop {pop_us:.2f} µs/op ({popped} popped, {left} deferred)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
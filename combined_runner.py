@@ -1,17 +1,20 @@
 import threading
 import time, os
-import datetime, pytz
-import csv, json, requests
-from dateutil import parser
+import datetime
+import csv, json
+from collections import Counter
 from datetime import datetime as dt
 from dotenv import load_dotenv
 from fastapi import FastAPI
 import uvicorn
 
+from lead_queue import LeadQueue
+
 load_dotenv()
 
-from vapi import Vapi
-from get_applicants_number import main as gmail_scan
+# NB : vapi, requests, pytz, dateutil et get_applicants_number (googleapiclient,
+# PyPDF2, python-docx, PyMuPDF) sont importés à la première utilisation pour
+# que le serveur réponde à /health le plus vite possible après un réveil Render.
 
 # === TIDYCAL CONFIG ===
 BOOKING_TYPE_ID = os.getenv("BOOKING_TYPE_ID")
@@ -20,7 +23,8 @@ BASE_URL = "https://tidycal.com/api"
 HEADERS = {"Authorization": TOKEN, "Content-Type": "application/json"}
 
 # ================= CONFIG VAPI / FICHIERS =================
-client = Vapi(token=os.getenv("VAPI_API_KEY"))
+_client = None
+_client_lock = threading.Lock()
 AGENT_ID = os.getenv("VAPI_AGENT_ID")
 PHONE_ID = os.getenv("PHONE_ID")
 URL = "https://get-tidycal-data.onrender.com"
@@ -28,10 +32,24 @@ URL = "https://get-tidycal-data.onrender.com"
 CSV_FILE = "phone_numbers.csv"
 CALLED_LOG = "called_numbers.csv"
 SUMMARY_FILE = "call_summaries.json"
+FINAL_STATUSES = ("completed", "ended")
+
+
+def get_client():
+    """Crée le client Vapi au premier appel (import de vapi différé)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from vapi import Vapi
+                _client = Vapi(token=os.getenv("VAPI_API_KEY"))
+    return _client
 
 
 def keep_alive():
     """Ping régulier du endpoint /wake-up pour éviter la mise en veille Render."""
+    import requests
+
     while True:
         try:
             r = requests.get(f"{URL}/wake-up", timeout=10)
@@ -46,6 +64,8 @@ def is_within_hours():
     Renvoie True si on est entre 7h du matin (07:00 AM)
     et 16h (4:00 PM) aujourd’hui — fuseau US/Eastern.
     """
+    import pytz
+
     tz = pytz.timezone("America/New_York")
     now = datetime.datetime.now(tz)
 
@@ -62,7 +82,25 @@ def load_called_numbers():
     with open(CALLED_LOG, newline='') as f:
         reader = csv.reader(f)
         next(reader, None)
-        return {row[0] for row in reader if row}
+        return {row[0] for row in reader if row and (len(row) < 2 or row[1] in FINAL_STATUSES)}
+
+
+def load_call_attempts():
+    """Nombre de tentatives sans réponse (no-answer, failed, timeout) par numéro."""
+    if not os.path.exists(CALLED_LOG):
+        return Counter()
+    with open(CALLED_LOG, newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return Counter(row[0] for row in reader if len(row) > 1 and row[1] not in FINAL_STATUSES)
+
+
+def parse_received_at(value):
+    """ReceivedAt ISO (écrit par le scan Gmail) → epoch, None si absent."""
+    try:
+        return dt.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
 
 
 def log_call(number, status):
@@ -78,29 +116,44 @@ def get_numbers_to_call():
     """
     Lit le CSV et renvoie une liste de dicts:
     [
-      {"number": "+1...", "email": "candidate@example.com"},
+      {"number": "+1...", "email": "candidate@example.com",
+       "received_at": 1731893545.0, "attempts": 0},
       ...
     ]
-    en excluant les numéros déjà appelés.
+    en excluant les numéros déjà appelés. L'ordre d'appel est décidé par LeadQueue.
     """
     called = load_called_numbers()
+    attempts = load_call_attempts()
     if not os.path.exists(CSV_FILE):
         return []
 
-    leads = []
     with open(CSV_FILE, newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            num = (row.get("Number") or "").strip()
-            email = (row.get("SenderEmail") or "").strip()
-            if num and num not in called:
-                leads.append({"number": num, "email": email})
+        rows = list(csv.DictReader(f))
+
+    # Un candidat déjà joint sur un numéro ne doit pas être rappelé sur un autre
+    called_emails = {
+        (row.get("SenderEmail") or "").strip().lower()
+        for row in rows
+        if (row.get("Number") or "").strip() in called
+    } - {"", "n/a"}
+
+    leads = []
+    for row in rows:
+        num = (row.get("Number") or "").strip()
+        email = (row.get("SenderEmail") or "").strip()
+        if num and num not in called and email.lower() not in called_emails:
+            leads.append({
+                "number": num,
+                "email": email,
+                "received_at": parse_received_at(row.get("ReceivedAt")),
+                "attempts": attempts[num],
+            })
     return leads
 
 
 def create_call(number):
     try:
-        call = client.calls.create(
+        call = get_client().calls.create(
             assistant_id=AGENT_ID,
             phone_number_id=PHONE_ID,
             customer={"number": number}
@@ -114,7 +167,7 @@ def create_call(number):
 
 def wait_for_completion(call_id):
     for _ in range(120):
-        call = client.calls.get(call_id)
+        call = get_client().calls.get(call_id)
         if call.status in ("completed", "failed", "no-answer", "ended"):
             return call
         time.sleep(5)
@@ -125,6 +178,9 @@ def parse_interview_time(text, default_tz="America/New_York"):
     Convertit un datetime en texte vers ISO 8601.
     Retourne None si impossible à parser.
     """
+    import pytz
+    from dateutil import parser
+
     if not text or not isinstance(text, str):
         return None
 
@@ -143,6 +199,7 @@ def parse_interview_time(text, default_tz="America/New_York"):
 
 
 def book_meeting_local(starts_at, name, email, phone, role, timezone="America/New_York"):
+    import requests
 
     if not all([starts_at, name, email, phone, role]):
         print("[BOOKING] Champs manquants pour la réservation:", {
@@ -182,22 +239,8 @@ def book_meeting_local(starts_at, name, email, phone, role, timezone="America/Ne
     }
 
 
-def save_summary(call_obj, number, email):
-    """
-    Sauvegarde le résumé dans un JSON
-    + déclenche le booking TidyCal en utilisant structured_data renvoyé par l'agent.
-    """
-    summary = getattr(call_obj.analysis, "summary", None)
-    structured_data = getattr(call_obj.analysis, "structured_data", None) or {}
-
-    entry = {
-        "number": number,
-        "timestamp": dt.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "summary": summary or "",
-        "structured_data": structured_data
-    }
-
-    # Sauvegarde le JSON
+def append_summary(entry):
+    """Ajoute une entrée au tableau JSON de SUMMARY_FILE."""
     if not os.path.exists(SUMMARY_FILE):
         with open(SUMMARY_FILE, "w", encoding="utf-8") as f:
             json.dump([entry], f, indent=2, ensure_ascii=False)
@@ -211,9 +254,12 @@ def save_summary(call_obj, number, email):
             f.seek(0)
             json.dump(data, f, indent=2, ensure_ascii=False)
 
-    print("[INFO] Data saved for", number)
 
-    # ========= ICI ON UTILISE LES DONNÉES DE L'AGENT POUR BOOKER =========
+def book_from_structured_data(structured_data, number, email):
+    """
+    Déclenche le booking TidyCal à partir du structured_data de l'agent.
+    Renvoie "booked", "failed" ou "skipped".
+    """
     # Adapte les clés suivant ce que tu mets dans structured_data depuis Vapi.
     qualified = structured_data.get("qualified")  # bool ou "yes"/"no"
     raw_time = structured_data.get("interview_time")
@@ -222,7 +268,7 @@ def save_summary(call_obj, number, email):
     if not interview_time:
         print("[ERROR] Impossible de parser la date :", raw_time)
         print("[INFO] Booking skipped.")
-        return
+        return "skipped"
 
     candidate_name = (
         structured_data.get("candidate_name")
@@ -248,13 +294,45 @@ def save_summary(call_obj, number, email):
             timezone=timezone
         )
         print("[INFO] Booking result:", result)
-    else:
-        print("[INFO] Pas de booking (qualified/interview_time manquant)",
-              "qualified=", qualified, "interview_time=", interview_time)
+        return "failed" if "error" in result else "booked"
+
+    print("[INFO] Pas de booking (qualified/interview_time manquant)",
+          "qualified=", qualified, "interview_time=", interview_time)
+    return "skipped"
+
+
+def save_summary(call_obj, number, email):
+    """
+    Déclenche le booking TidyCal en utilisant structured_data renvoyé par l'agent,
+    puis sauvegarde le résumé + le résultat du booking dans un JSON.
+    """
+    summary = getattr(call_obj.analysis, "summary", None)
+    structured_data = getattr(call_obj.analysis, "structured_data", None) or {}
+
+    entry = {
+        "number": number,
+        "timestamp": dt.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "summary": summary or "",
+        "structured_data": structured_data
+    }
+
+    # ========= ICI ON UTILISE LES DONNÉES DE L'AGENT POUR BOOKER =========
+    try:
+        entry["booking"] = book_from_structured_data(structured_data, number, email)
+    except Exception as e:
+        print("[BOOKING] Booking error:", e)
+        entry["booking"] = "failed"
+
+    append_summary(entry)
+    print("[INFO] Data saved for", number)
 
 
 # ================= MAIN JOB LOOP =================
 def job_loop():
+    # File persistante entre les cycles : les nouveaux leads y sont poussés
+    # (O(log n)) et les plus prioritaires sont appelés en premier.
+    queue = LeadQueue()
+
     print("[INFO] Background worker started ✅")
     while True:
         try:
@@ -263,33 +341,41 @@ def job_loop():
                 time.sleep(1800)
                 continue
 
+            # Import différé ; dans le try pour qu'un échec (ex. GOOGLE_CREDENTIALS_B64
+            # invalide) soit loggé et retenté au lieu de tuer le thread en silence.
+            from get_applicants_number import main as gmail_scan
+
             print("[INFO] Scanning Gmail and making calls...")
             gmail_scan()
 
-            leads = get_numbers_to_call()
-            if not leads:
-                print("[INFO] No numbers to call. Sleeping 30min...")
+            for lead in get_numbers_to_call():
+                queue.push(lead)
+
+            lead = queue.pop()
+            if not lead:
+                print(f"[INFO] No numbers to call now ({len(queue)} waiting). Sleeping 30min...")
                 time.sleep(1800)
                 continue
 
-            for lead in leads:
+            while lead:
                 num = lead["number"]
                 email = lead.get("email") or ""
 
                 call_id = create_call(num)
-                if not call_id:
-                    continue
+                if call_id:
+                    call_obj = wait_for_completion(call_id)
+                    if not call_obj:
+                        log_call(num, "timeout")
+                    elif call_obj.status in FINAL_STATUSES:
+                        log_call(num, call_obj.status)
+                        save_summary(call_obj, num, email)
+                        print("[SUCCESS] Call completed for", num)
+                    else:
+                        log_call(num, call_obj.status)
 
-                call_obj = wait_for_completion(call_id)
-                if not call_obj:
-                    continue
+                    time.sleep(10)
 
-                if call_obj.status in ("completed", "ended"):
-                    log_call(num, call_obj.status)
-                    save_summary(call_obj, num, email)
-                    print("[SUCCESS] Call completed for", num)
-
-                time.sleep(10)
+                lead = queue.pop()
 
             # VERY IMPORTANT — prevents double calls
             print("[INFO] Sleeping 30min before next cycle...")
@@ -312,11 +398,25 @@ def health():
     return {"ok": True}
 
 
-if __name__ == "__main__":
-    # Lancer ton worker dans un thread de fond
+def start_workers_when_ready(server):
+    """
+    Attend que uvicorn ait ouvert le port avant de lancer les threads de fond,
+    pour que les imports lourds du worker ne retardent pas le bind.
+    """
+    while not server.started:
+        if server.should_exit:
+            return
+        time.sleep(0.1)
+
     threading.Thread(target=job_loop, daemon=True).start()
     threading.Thread(target=keep_alive, daemon=True).start()
 
-    # Lancer le mini-serveur FastAPI
+
+if __name__ == "__main__":
+    # Lancer le mini-serveur FastAPI (bind en premier)
     port = int(os.getenv("PORT", 10000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    server = uvicorn.Server(uvicorn.Config(app, host="0.0.0.0", port=port))
+
+    # Lancer ton worker dans un thread de fond, une fois le serveur prêt
+    threading.Thread(target=start_workers_when_ready, args=(server,), daemon=True).start()
+    server.run()
\ No newline at end of file
@@ -1,15 +1,12 @@
 # gmail_extract_numbers.py
 import os, re, base64, csv, json
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from PyPDF2 import PdfReader
-from docx import Document
+from datetime import datetime, timezone
 from dotenv import load_dotenv
-import fitz
 load_dotenv()
 
+# NB : les clients Google, PyPDF2, python-docx et PyMuPDF (fitz) sont importés
+# dans les fonctions qui s'en servent, pour garder l'import de ce module léger.
+
 # ---------------------------
 # CONFIGURATION
 # ---------------------------
@@ -18,6 +15,7 @@ CREDS_FILE = 'credentials.json'
 TOKEN_FILE = 'token.json'
 SAVE_DIR = 'attachments_temp'
 OUTPUT_FILE = 'phone_numbers.csv'
+HEADER = ['File', 'Number', 'SenderEmail', 'ReceivedAt']
 
 # Si les credentials sont encodés en Base64 (Render, etc.)
 if os.getenv("GOOGLE_CREDENTIALS_B64"):
@@ -29,6 +27,11 @@ if os.getenv("GOOGLE_CREDENTIALS_B64"):
 # AUTHENTIFICATION GMAIL
 # ---------------------------
 def auth_gmail():
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from googleapiclient.discovery import build
+
     creds = None
     token_env = os.getenv("GOOGLE_TOKEN")
 
@@ -68,6 +71,16 @@ def load_processed_files():
                     processed.add(row[0])
     return processed
 
+def upgrade_header():
+    """Ancien en-tête (sans ReceivedAt) → en-tête courant, lignes inchangées."""
+    with open(OUTPUT_FILE, newline='') as f:
+        rows = list(csv.reader(f))
+    with open(OUTPUT_FILE, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows[1:])
+    print(f"[INFO] [*] {OUTPUT_FILE} header upgraded to {','.join(HEADER)}")
+
 def find_messages(service, subject_phrase, max_results=50):
     query = f'subject:"{subject_phrase}" has:attachment'
     results = service.users().messages().list(userId='me', q=query, maxResults=max_results).execute()
@@ -80,6 +93,13 @@ def download_attachments(service, msg_id, processed_files):
     msg = service.users().messages().get(userId='me', id=msg_id, format='full').execute()
     attachments = []
 
+    # 🔹 Date de réception (ms epoch) → ISO UTC, sert à prioriser les leads récents
+    received_at = ""
+    if msg.get("internalDate"):
+        received_at = datetime.fromtimestamp(
+            int(msg["internalDate"]) / 1000, tz=timezone.utc
+        ).isoformat(timespec="seconds")
+
     # 🔹 Récupère l’adresse email de l’expéditeur
     sender_email = None
     headers = msg.get("payload", {}).get("headers", [])
@@ -115,12 +135,14 @@ def download_attachments(service, msg_id, processed_files):
 
     payload = msg.get('payload', {})
     recurse_parts(payload.get('parts', []))
-    return attachments, sender_email
+    return attachments, sender_email, received_at
 
 # ---------------------------
 # EXTRACTION DE NUMÉROS
 # ---------------------------
 def extract_numbers_from_pdf(path):
+    from PyPDF2 import PdfReader
+
     numbers = set()
     try:
         with open(path, 'rb') as f:
@@ -131,6 +153,7 @@ def extract_numbers_from_pdf(path):
     except Exception as e:
         print(f"[WARNING] PyPDF2 failed ({e}). Retrying with PyMuPDF...")
         try:
+            import fitz
             doc = fitz.open(path)
             for page in doc:
                 text = page.get_text("text")
@@ -140,6 +163,8 @@ def extract_numbers_from_pdf(path):
     return numbers
 
 def extract_numbers_from_docx(path):
+    from docx import Document
+
     numbers = set()
     doc = Document(path)
     for p in doc.paragraphs:
@@ -171,7 +196,7 @@ def main():
     results = []
     for i, msg_id in enumerate(ids, 1):
         print(f"[INFO] [*] Processing email {i}/{len(ids)} ...")
-        attachments, sender_email = download_attachments(service, msg_id, processed_files)
+        attachments, sender_email, received_at = download_attachments(service, msg_id, processed_files)
         if not attachments:
             print("[INFO] [*] No new attachments.")
             continue
@@ -188,7 +213,7 @@ def main():
                 valid_nums = [normalize_phone(n) for n in nums if looks_like_phone(n)]
                 if valid_nums:
                     for n in valid_nums:
-                        results.append((os.path.basename(att), n, sender_email or "N/A"))
+                        results.append((os.path.basename(att), n, sender_email or "N/A", received_at))
                         print(f"[INFO] [*] {att} → {n} ({sender_email})")
                 else:
                     print("[WARNING] [!] No valid number found.")
@@ -209,12 +234,14 @@ def main():
             with open(OUTPUT_FILE, 'r', newline='') as f_check:
                 first_line = f_check.readline().strip()
                 has_header = first_line.startswith("File,")
+            if has_header and first_line != ",".join(HEADER):
+                upgrade_header()
 
         # Écrit les nouvelles lignes
         with open(OUTPUT_FILE, 'a', newline='') as f:
             writer = csv.writer(f)
             if not file_exists or not has_header:
-                writer.writerow(['File', 'Number', 'SenderEmail'])
+                writer.writerow(HEADER)
             for r in sorted(set(results)):
                 writer.writerow(r)
 
@@ -0,0 +1,172 @@
+# lead_queue.py
+"""
+File de priorité des candidats à appeler.
+
+Un tas (heapq) par fuseau horaire, indexé par candidat :
+  - push en O(log n), pop en O(z · log n) avec z = nombre de fuseaux (≤ 7) :
+    seuls les sommets des tas dont le fuseau est en heures d'appel sont
+    comparés, les leads hors heures ne sont jamais dépilés ;
+  - mise à jour d'un lead existant par suppression paresseuse de l'ancienne
+    entrée du tas ;
+  - dédoublonnage sur le numéro ET l'email (plusieurs CV d'un même candidat
+    = un seul lead) ;
+  - score = date de candidature (les plus récents d'abord), pénalisée par les
+    tentatives d'appel déjà faites ;
+  - pop() saute les candidats pour qui il est trop tôt / trop tard en heure
+    locale (fuseau déduit de l'indicatif régional).
+"""
+import heapq, itertools, re
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+# ---------------------------
+# CONFIGURATION
+# ---------------------------
+ATTEMPT_PENALTY = 24 * 3600     # une tentative = candidature 24h plus ancienne
+MAX_ATTEMPTS = 3                # au-delà, le lead n'est plus appelé
+LOCAL_CALL_HOURS = (8, 20)      # heures d'appel acceptables chez le candidat
+DEFAULT_TZ = "America/New_York"
+
+# Indicatifs US hors fuseau Eastern (les autres → DEFAULT_TZ)
+AREA_CODES_BY_TZ = {
+    "America/Chicago": (
+        "205 210 214 217 218 224 225 228 251 254 256 262 274 281 308 309 312 314 "
+        "316 318 319 320 325 331 334 337 346 361 402 405 409 414 417 430 432 447 "
+        "464 469 479 501 504 507 512 515 531 534 539 557 563 573 580 601 605 608 "
+        "612 615 618 620 629 630 636 641 651 659 660 662 682 701 708 712 713 715 "
+        "726 731 737 763 769 773 779 785 806 815 816 817 830 832 847 870 872 901 "
+        "903 913 918 920 931 936 938 940 945 952 956 972 979 985"
+    ),
+    "America/Denver": "208 303 307 385 406 435 505 575 719 720 801 915 970 983 986",
+    "America/Phoenix": "480 520 602 623 928",
+    "America/Los_Angeles": (
+        "206 209 213 253 279 310 323 341 350 360 408 415 424 425 442 458 503 509 "
+        "510 530 541 559 562 564 619 626 628 650 657 661 669 702 707 714 725 747 "
+        "760 775 805 818 820 831 840 858 909 916 925 949 951 971"
+    ),
+    "America/Anchorage": "907",
+    "Pacific/Honolulu": "808",
+}
+AREA_CODE_TZ = {code: tz for tz, codes in AREA_CODES_BY_TZ.items() for code in codes.split()}
+
+_REMOVED = object()
+
+
+def timezone_for_number(number):
+    """Fuseau du candidat d'après l'indicatif régional (+1 AAA ...)."""
+    digits = re.sub(r"\D", "", number or "")
+    if len(digits) == 11 and digits.startswith("1"):
+        return AREA_CODE_TZ.get(digits[1:4], DEFAULT_TZ)
+    return DEFAULT_TZ
+
+
+def is_callable_in(tz, now):
+    """True si l'heure locale du fuseau `tz` est dans LOCAL_CALL_HOURS."""
+    start, end = LOCAL_CALL_HOURS
+    return start <= now.astimezone(ZoneInfo(tz)).hour < end
+
+
+def is_callable_now(number, now):
+    """True si l'heure locale du candidat est dans LOCAL_CALL_HOURS."""
+    return is_callable_in(timezone_for_number(number), now)
+
+
+def score(lead):
+    """Plus petit = appelé en premier."""
+    received = lead.get("received_at") or 0
+    return -received + ATTEMPT_PENALTY * (lead.get("attempts") or 0)
+
+
+def _valid_email(email):
+    return bool(email) and "@" in email
+
+
+# ---------------------------
+# FILE DE PRIORITÉ
+# ---------------------------
+class LeadQueue:
+    """
+    Leads : dicts {"number", "email", "received_at" (epoch s ou None),
+    "attempts"}. Un même candidat (numéro ou email en commun) n'apparaît
+    qu'une fois ; le lead le plus récent remplace l'ancien.
+    """
+
+    def __init__(self):
+        self._heaps = {}                # fuseau -> tas de [score, candidat, lead]
+        self._entries = {}              # candidat -> entrée du tas
+        self._aliases = {}              # candidat -> numéros + emails connus
+        self._index = {}                # numéro ou email -> candidat
+        self._seq = itertools.count()   # id candidat, départage FIFO à score égal
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, number):
+        return number in self._index
+
+    def push(self, lead):
+        """
+        Ajoute ou met à jour un lead. Si le numéro ou l'email est déjà connu,
+        les entrées du même candidat sont fusionnées. Renvoie False si le lead
+        est ignoré (pas de numéro, trop de tentatives).
+        """
+        number = lead.get("number")
+        email = (lead.get("email") or "").strip().lower()
+        if not number:
+            return False
+
+        aliases = {number} | ({email} if _valid_email(email) else set())
+        attempts = lead.get("attempts") or 0
+        for key in {self._index[a] for a in aliases if a in self._index}:
+            old = self._entries[key][2]
+            attempts = max(attempts, old.get("attempts") or 0)
+            if (old.get("received_at") or 0) > (lead.get("received_at") or 0):
+                lead = old      # on garde le CV le plus récent
+            aliases |= self._drop(key)
+
+        if attempts >= MAX_ATTEMPTS:
+            return False
+
+        key = next(self._seq)
+        lead = dict(lead, attempts=attempts)
+        entry = [score(lead), key, lead]
+        self._entries[key] = entry
+        self._aliases[key] = aliases
+        for a in aliases:
+            self._index[a] = key
+        heapq.heappush(self._heaps.setdefault(timezone_for_number(lead["number"]), []), entry)
+        return True
+
+    def pop(self, now=None):
+        """
+        Renvoie le meilleur lead joignable à l'heure `now` (UTC par défaut),
+        ou None. Les leads hors heures locales restent dans leur tas.
+        """
+        now = now or datetime.now(timezone.utc)
+        best = None
+        for tz, heap in self._heaps.items():
+            if not is_callable_in(tz, now):
+                continue
+            while heap and heap[0][2] is _REMOVED:
+                heapq.heappop(heap)
+            if heap and (best is None or heap[0] < best[0]):
+                best = heap[0], heap
+        if best is None:
+            return None
+
+        entry = heapq.heappop(best[1])
+        lead = entry[2]
+        self._drop(entry[1])
+        return lead
+
+    def _drop(self, key):
+        """
+        Retire un candidat des index et renvoie ses alias. Son entrée reste
+        dans son tas, marquée _REMOVED (suppression paresseuse).
+        """
+        entry = self._entries.pop(key)
+        entry[2] = _REMOVED
+        aliases = self._aliases.pop(key)
+        for a in aliases:
+            del self._index[a]
+        return aliases
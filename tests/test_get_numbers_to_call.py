@@ -0,0 +1,87 @@
+import csv
+from datetime import datetime, timezone
+
+import pytest
+
+combined_runner = pytest.importorskip("combined_runner")
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows(rows)
+
+
+def by_number(leads):
+    return {l["number"]: l for l in leads}
+
+
+def test_no_csv_returns_empty():
+    assert combined_runner.get_numbers_to_call() == []
+
+
+def test_legacy_three_column_rows_have_no_received_at():
+    write_csv(combined_runner.CSV_FILE, [
+        ["File", "Number", "SenderEmail"],
+        ["cv.pdf", "+12125550001", "a@x.com"],
+    ])
+    (only,) = combined_runner.get_numbers_to_call()
+    assert only == {"number": "+12125550001", "email": "a@x.com",
+                    "received_at": None, "attempts": 0}
+
+
+def test_received_at_is_parsed_to_epoch():
+    write_csv(combined_runner.CSV_FILE, [
+        ["File", "Number", "SenderEmail", "ReceivedAt"],
+        ["cv.pdf", "+12125550001", "a@x.com", "2025-11-18T01:32:25+00:00"],
+        ["cv2.pdf", "+12125550002", "b@x.com", ""],
+    ])
+    leads = by_number(combined_runner.get_numbers_to_call())
+    expected = datetime(2025, 11, 18, 1, 32, 25, tzinfo=timezone.utc).timestamp()
+    assert leads["+12125550001"]["received_at"] == expected
+    assert leads["+12125550002"]["received_at"] is None
+
+
+def test_only_final_statuses_count_as_called():
+    write_csv(combined_runner.CSV_FILE, [
+        ["File", "Number", "SenderEmail", "ReceivedAt"],
+        ["a.pdf", "+12125550001", "a@x.com", ""],
+        ["b.pdf", "+12125550002", "b@x.com", ""],
+        ["c.pdf", "+12125550003", "c@x.com", ""],
+    ])
+    write_csv(combined_runner.CALLED_LOG, [
+        ["Number", "Status", "Timestamp"],
+        ["+12125550001", "completed", "2025-11-18 10:00:00"],
+        ["+12125550002", "no-answer", "2025-11-18 10:05:00"],
+        ["+12125550002", "failed", "2025-11-18 11:05:00"],
+        ["+12125550003", "timeout", "2025-11-18 11:10:00"],
+    ])
+    leads = by_number(combined_runner.get_numbers_to_call())
+    assert set(leads) == {"+12125550002", "+12125550003"}
+    assert leads["+12125550002"]["attempts"] == 2
+    assert leads["+12125550003"]["attempts"] == 1
+
+
+def test_candidate_reached_on_another_number_is_skipped():
+    write_csv(combined_runner.CSV_FILE, [
+        ["File", "Number", "SenderEmail", "ReceivedAt"],
+        ["a.pdf", "+12125550001", "A@x.com", ""],
+        ["a2.pdf", "+12125550002", "a@x.com", ""],
+        ["n1.pdf", "+12125550003", "N/A", ""],
+        ["n2.pdf", "+12125550004", "N/A", ""],
+        ["e.pdf", "+12125550005", "", ""],
+    ])
+    write_csv(combined_runner.CALLED_LOG, [
+        ["Number", "Status", "Timestamp"],
+        ["+12125550001", "ended", "2025-11-18 10:00:00"],
+        ["+12125550003", "completed", "2025-11-18 10:00:00"],
+        ["+12125550005", "completed", "2025-11-18 10:00:00"],
+    ])
+    leads = by_number(combined_runner.get_numbers_to_call())
+    # a@x.com déjà joint ; "N/A" et email vide ne suppriment personne d'autre
+    assert set(leads) == {"+12125550004"}
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+
+import lead_queue
+from lead_queue import LeadQueue, timezone_for_number
+
+NOON_ET = datetime(2025, 11, 18, 17, 0, tzinfo=timezone.utc)    # 9h PT
+NINE_ET = datetime(2025, 11, 18, 14, 0, tzinfo=timezone.utc)    # 6h PT
+
+
+def lead(number, email="", received_at=0, attempts=0):
+    return {"number": number, "email": email, "received_at": received_at, "attempts": attempts}
+
+
+def drain(q, now=NOON_ET):
+    out = []
+    while (l := q.pop(now)) is not None:
+        out.append(l)
+    return out
+
+
+def test_timezone_for_number():
+    assert timezone_for_number("+14155550001") == "America/Los_Angeles"
+    assert timezone_for_number("+13125550001") == "America/Chicago"
+    assert timezone_for_number("+12125550001") == "America/New_York"
+    assert timezone_for_number("+33612345678") == lead_queue.DEFAULT_TZ
+    assert timezone_for_number("") == lead_queue.DEFAULT_TZ
+
+
+def test_newest_first_and_attempts_penalty():
+    q = LeadQueue()
+    q.push(lead("+12125550001", received_at=1000))
+    q.push(lead("+12125550002", received_at=2000))
+    # Plus récente, mais une tentative = 24h de pénalité
+    q.push(lead("+12125550003", received_at=3000, attempts=1))
+    assert [l["number"] for l in drain(q)] == ["+12125550002", "+12125550001", "+12125550003"]
+
+
+def test_same_email_merges_and_keeps_newest_resume():
+    q = LeadQueue()
+    q.push(lead("+12125550001", "A@x.com", received_at=100))
+    q.push(lead("+12125550002", "a@x.com", received_at=300))
+    q.push(lead("+12125550003", "a@x.com", received_at=200))
+    assert len(q) == 1
+    assert [l["number"] for l in drain(q)] == ["+12125550002"]
+    for number in ("+12125550001", "+12125550002", "+12125550003"):
+        assert number not in q
+
+
+def test_same_number_merges_and_keeps_max_attempts():
+    q = LeadQueue()
+    q.push(lead("+12125550001", "a@x.com", received_at=100, attempts=2))
+    q.push(lead("+12125550001", "", received_at=500, attempts=0))
+    (only,) = drain(q)
+    assert only["received_at"] == 500
+    assert only["attempts"] == 2
+
+
+def test_lead_bridging_two_candidates_merges_both():
+    q = LeadQueue()
+    q.push(lead("+12125550001", "a@x.com", received_at=100))
+    q.push(lead("+12125550002", "b@x.com", received_at=200))
+    # Numéro du premier, email du second
+    q.push(lead("+12125550001", "b@x.com", received_at=150, attempts=1))
+    assert len(q) == 1
+    (only,) = drain(q)
+    assert only["number"] == "+12125550002"
+    assert only["attempts"] == 1
+    assert len(q) == 0 and q._index == {} and q._aliases == {}
+
+
+def test_na_or_empty_email_does_not_merge():
+    q = LeadQueue()
+    q.push(lead("+12125550001", "N/A", received_at=100))
+    q.push(lead("+12125550002", "N/A", received_at=200))
+    q.push(lead("+12125550003", "", received_at=300))
+    assert len(q) == 3
+
+
+def test_max_attempts_drops_new_and_existing_leads():
+    q = LeadQueue()
+    assert q.push(lead("+12125550001", attempts=lead_queue.MAX_ATTEMPTS)) is False
+    assert len(q) == 0
+
+    q.push(lead("+12125550002", "b@x.com", attempts=1))
+    assert q.push(lead("+12125550002", "b@x.com", attempts=lead_queue.MAX_ATTEMPTS)) is False
+    assert len(q) == 0
+    assert "+12125550002" not in q
+    assert drain(q) == []
+
+
+def test_updates_leave_tombstones_that_pop_skips():
+    q = LeadQueue()
+    for received_at in (100, 200, 300):
+        q.push(lead("+12125550001", received_at=received_at))
+    q.push(lead("+12125550002", received_at=50))
+    assert len(q) == 2
+    heap = q._heaps["America/New_York"]
+    assert sum(e[2] is lead_queue._REMOVED for e in heap) == 2
+
+    popped = drain(q)
+    assert [(l["number"], l["received_at"]) for l in popped] == [
+        ("+12125550001", 300), ("+12125550002", 50)]
+    assert heap == []
+
+
+def test_leads_outside_local_hours_stay_queued():
+    q = LeadQueue()
+    q.push(lead("+14155550001", received_at=900))      # Pacific, plus récent
+    q.push(lead("+12125550001", received_at=100))
+
+    assert [l["number"] for l in drain(q, NINE_ET)] == ["+12125550001"]
+    assert len(q) == 1 and "+14155550001" in q
+    assert [l["number"] for l in drain(q, NOON_ET)] == ["+14155550001"]